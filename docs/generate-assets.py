@@ -1,15 +1,24 @@
 #!/usr/bin/env python3
 """
 Generate favicon PNGs and og-image for pedantic_raven
-Requires: pip install Pillow cairosvg
+Requires: pip install cairosvg
+
+Outputs are skipped when their inputs are unchanged since the last run,
+tracked by content hash in .asset-manifest.json. The manifest is
+git-ignored (docs/ is published to Pages as-is), so the skip applies to
+local re-runs only; CI uses the committed PNGs and never runs this script.
 """
 
+import hashlib
+import json
+from pathlib import Path
+
 try:
-    from PIL import Image, ImageDraw, ImageFont
-    import cairosvg
+    from cairosvg.parser import Tree
+    from cairosvg.surface import PNGSurface
 except ImportError:
     print("Missing dependencies. Install with:")
-    print("  pip install Pillow cairosvg")
+    print("  pip install cairosvg")
     exit(1)
 
 # Colors
@@ -17,68 +26,70 @@ TEAL = "#16A085"
 BG_LIGHT = "#ffffff"
 BG_DARK = "#000000"
 
-# Generate PNG favicons from SVG
-print("Generating favicon-16x16.png...")
-cairosvg.svg2png(
-    url="favicon.svg",
-    write_to="favicon-16x16.png",
-    output_width=16,
-    output_height=16
-)
-
-print("Generating favicon-32x32.png...")
-cairosvg.svg2png(
-    url="favicon.svg",
-    write_to="favicon-32x32.png",
-    output_width=32,
-    output_height=32
-)
+MANIFEST_PATH = Path(".asset-manifest.json")
+
+
+def content_hash(data):
+    """Return a short hex digest identifying the given bytes."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def is_current(manifest, out_name, digest):
+    """Check whether out_name exists and was built from inputs with digest."""
+    return manifest.get(out_name) == digest and Path(out_name).exists()
+
+
+def generate_og_image(out_name):
+    """Render the 1200x630 social preview image as SVG and rasterize it."""
+    svg = f"""<svg xmlns="http://www.w3.org/2000/svg" width="1200" height="630">
+  <rect width="100%" height="100%" fill="{BG_LIGHT}"/>
+  <text x="150" y="400" font-family="Arial Unicode MS, Arial, sans-serif" font-size="200" fill="{TEAL}">⟡</text>
+  <text x="450" y="260" font-family="Arial, sans-serif" font-size="72" font-weight="bold" fill="#000000">Pedantic Raven</text>
+  <text x="450" y="350" font-family="Arial, sans-serif" font-size="36" fill="#666666">Context Engineering for AI Systems</text>
+  <text x="450" y="405" font-family="Arial, sans-serif" font-size="28" fill="#888888">Offline-first semantic knowledge graphs</text>
+</svg>"""
+    PNGSurface(
+        Tree(bytestring=svg.encode()),
+        out_name,
+        96,
+        output_width=1200,
+        output_height=630
+    ).finish()
+
+
+manifest = json.loads(MANIFEST_PATH.read_text()) if MANIFEST_PATH.exists() else {}
+
+# Favicons depend on the SVG source; the og-image is defined by this script
+favicon_hash = content_hash(Path("favicon.svg").read_bytes())
+og_image_hash = content_hash(Path(__file__).read_bytes())
+
+# Generate PNG favicons from SVG, parsing the source once and
+# rasterizing the shared tree at each size
+favicon_tree = None
+for size, out_name in [(16, "favicon-16x16.png"), (32, "favicon-32x32.png")]:
+    if is_current(manifest, out_name, favicon_hash):
+        print(f"{out_name} unchanged, skipping")
+        continue
+
+    print(f"Generating {out_name}...")
+    if favicon_tree is None:
+        favicon_tree = Tree(url="favicon.svg")
+    PNGSurface(
+        favicon_tree,
+        out_name,
+        96,
+        output_width=size,
+        output_height=size
+    ).finish()
+    manifest[out_name] = favicon_hash
 
 # Generate og-image (1200x630)
-print("Generating og-image.png...")
-img = Image.new('RGB', (1200, 630), BG_LIGHT)
-draw = ImageDraw.Draw(img)
+if is_current(manifest, "og-image.png", og_image_hash):
+    print("og-image.png unchanged, skipping")
+else:
+    print("Generating og-image.png...")
+    generate_og_image("og-image.png")
+    manifest["og-image.png"] = og_image_hash
 
-# Try to load fonts, fall back to default
-try:
-    title_font = ImageFont.truetype("/System/Library/Fonts/Supplemental/Arial Bold.ttf", 72)
-    subtitle_font = ImageFont.truetype("/System/Library/Fonts/Supplemental/Arial.ttf", 36)
-    symbol_font = ImageFont.truetype("/System/Library/Fonts/Supplemental/Arial Unicode.ttf", 200)
-except:
-    print("Using default font (install truetype fonts for better results)")
-    title_font = ImageFont.load_default()
-    subtitle_font = ImageFont.load_default()
-    symbol_font = ImageFont.load_default()
-
-# Draw symbol (⟡)
-symbol_bbox = draw.textbbox((0, 0), "⟡", font=symbol_font)
-symbol_width = symbol_bbox[2] - symbol_bbox[0]
-symbol_height = symbol_bbox[3] - symbol_bbox[1]
-symbol_x = 150
-symbol_y = (630 - symbol_height) // 2
-draw.text((symbol_x, symbol_y), "⟡", fill=TEAL, font=symbol_font)
-
-# Draw title
-title = "Pedantic Raven"
-title_bbox = draw.textbbox((0, 0), title, font=title_font)
-title_x = 450
-title_y = 200
-draw.text((title_x, title_y), title, fill="#000000", font=title_font)
-
-# Draw subtitle
-subtitle = "Context Engineering for AI Systems"
-subtitle_bbox = draw.textbbox((0, 0), subtitle, font=subtitle_font)
-subtitle_x = 450
-subtitle_y = 320
-draw.text((subtitle_x, subtitle_y), subtitle, fill="#666666", font=subtitle_font)
-
-# Draw tagline
-tagline = "Offline-first semantic knowledge graphs"
-tagline_font = ImageFont.truetype("/System/Library/Fonts/Supplemental/Arial.ttf", 28) if title_font != ImageFont.load_default() else subtitle_font
-tagline_x = 450
-tagline_y = 380
-draw.text((tagline_x, tagline_y), tagline, fill="#888888", font=tagline_font)
-
-# Save
-img.save("og-image.png")
-print("Done! Generated favicon-16x16.png, favicon-32x32.png, and og-image.png")
+MANIFEST_PATH.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n")
+print("Done! favicon-16x16.png, favicon-32x32.png, and og-image.png are up to date")
@@ -0,0 +1,202 @@
+"""
+Micro-batching layer for GLiNER2 inference.
+
+Concurrent /extract requests are coalesced into a single model call so the
+transformer runs one batched forward pass instead of one pass per request.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from model import GLiNERModel, get_model
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of texts sent to the model in one forward pass
+MAX_BATCH = 16
+
+# How long to wait for more requests after the first one arrives
+BATCH_WINDOW_SECONDS = 0.005
+
+
+@dataclass
+class _PendingRequest:
+    """A queued extraction request awaiting its batch."""
+    text: str
+    entity_types: List[str]
+    threshold: float
+    future: asyncio.Future
+
+
+class EntityBatcher:
+    """Coalesces in-flight extraction requests into batched model calls."""
+
+    def __init__(
+        self,
+        model: GLiNERModel,
+        max_batch: int = MAX_BATCH,
+        window: float = BATCH_WINDOW_SECONDS
+    ):
+        self.model = model
+        self.max_batch = max_batch
+        self.window = window
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # Requests taken off the queue whose batch has not finished yet
+        self._in_flight: List[_PendingRequest] = []
+
+    def start(self) -> None:
+        """Start the background batching task (idempotent)."""
+        if self._task is not None and not self._task.done():
+            return
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task and fail any requests not yet answered."""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        pending = self._in_flight
+        self._in_flight = []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for item in pending:
+            self._resolve(item, error=RuntimeError("Batcher stopped"))
+
+    async def submit(
+        self,
+        text: str,
+        entity_types: List[str],
+        threshold: float = 0.3
+    ) -> List[Dict]:
+        """
+        Queue a text for extraction and wait for its batch to complete.
+
+        Args:
+            text: Input text to analyze
+            entity_types: List of entity types to extract
+            threshold: Confidence threshold (0.0-1.0)
+
+        Returns:
+            List of entities with text, label, start, end, score
+        """
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(_PendingRequest(text, entity_types, threshold, future))
+        return await future
+
+    async def _collect(self) -> List[_PendingRequest]:
+        """Wait for one request, then gather more until the window closes."""
+        loop = asyncio.get_running_loop()
+        # Collect straight into _in_flight so stop() can see partial batches
+        items = self._in_flight = [await self._queue.get()]
+        deadline = loop.time() + self.window
+
+        while len(items) < self.max_batch:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                items.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+
+        return items
+
+    async def _run(self) -> None:
+        """Drain the queue forever, dispatching one model call per label set."""
+        while True:
+            items = await self._collect()
+
+            # GLiNER scores a batch against a single label set, so requests
+            # with different entity types or thresholds go in separate calls.
+            groups: Dict[Tuple[Tuple[str, ...], float], List[_PendingRequest]] = {}
+            for item in items:
+                key = (tuple(item.entity_types), item.threshold)
+                groups.setdefault(key, []).append(item)
+
+            for (entity_types, threshold), group in groups.items():
+                await self._dispatch(group, list(entity_types), threshold)
+
+            self._in_flight = []
+
+    async def _dispatch(
+        self,
+        group: List[_PendingRequest],
+        entity_types: List[str],
+        threshold: float
+    ) -> None:
+        """Run one batched model call and resolve each request's future."""
+        try:
+            # Run the model in a worker thread so the event loop keeps
+            # accepting requests for the next batch meanwhile
+            results = await asyncio.to_thread(
+                self.model.extract_entities_batch,
+                [item.text for item in group],
+                entity_types,
+                threshold
+            )
+        except Exception as e:
+            if len(group) == 1:
+                self._resolve(group[0], error=e)
+                return
+
+            # Retry one text at a time so a single bad input only fails
+            # its own request, not everything that shared its window
+            logger.warning(f"Batch of {len(group)} texts failed, retrying individually: {e}")
+            for item in group:
+                if item.future.done():
+                    continue
+                try:
+                    entities = (await asyncio.to_thread(
+                        self.model.extract_entities_batch,
+                        [item.text],
+                        entity_types,
+                        threshold
+                    ))[0]
+                except Exception as item_error:
+                    self._resolve(item, error=item_error)
+                else:
+                    self._resolve(item, entities=entities)
+            return
+
+        logger.debug(f"Processed batch of {len(group)} texts")
+        for item, entities in zip(group, results):
+            self._resolve(item, entities=entities)
+
+    @staticmethod
+    def _resolve(
+        item: _PendingRequest,
+        entities: Optional[List[Dict]] = None,
+        error: Optional[Exception] = None
+    ) -> None:
+        """Complete a request's future with its entities or an error."""
+        # Skip requests whose client went away while the batch ran
+        if item.future.done():
+            return
+        if error is not None:
+            item.future.set_exception(error)
+        else:
+            item.future.set_result(entities)
+
+
+# Global batcher instance (singleton)
+_global_batcher: Optional[EntityBatcher] = None
+
+
+def get_batcher() -> EntityBatcher:
+    """Get or create global batcher instance."""
+    global _global_batcher
+    if _global_batcher is None:
+        _global_batcher = EntityBatcher(get_model())
+    return _global_batcher
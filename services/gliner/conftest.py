@@ -0,0 +1,6 @@
+"""
+Shared pytest configuration for the GLiNER service.
+
+Living at the service root puts main.py, model.py and batcher.py on
+sys.path for the tests.
+"""
@@ -0,0 +1,156 @@
+"""
+Tests for the micro-batching layer, using a fake model in place of GLiNER2.
+"""
+
+import asyncio
+import threading
+from typing import Dict, List
+
+import pytest
+import pytest_asyncio
+
+from batcher import EntityBatcher
+
+
+class FakeModel:
+    """Records batched calls and returns one entity per text."""
+
+    def __init__(self, fail_on: str = None):
+        self.fail_on = fail_on
+        self.calls = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def extract_entities_batch(
+        self,
+        texts: List[str],
+        entity_types: List[str],
+        threshold: float = 0.3
+    ) -> List[List[Dict]]:
+        self.release.wait(timeout=5)
+        self.calls.append((list(texts), tuple(entity_types), threshold))
+        if self.fail_on in texts:
+            raise ValueError("bad input")
+        return [
+            [{"text": text, "label": entity_types[0], "start": 0, "end": len(text), "score": 0.9}]
+            for text in texts
+        ]
+
+
+@pytest_asyncio.fixture
+async def fake_batcher():
+    batchers = []
+
+    def make(model: FakeModel, window: float = 0.05) -> EntityBatcher:
+        batcher = EntityBatcher(model, window=window)
+        batchers.append(batcher)
+        return batcher
+
+    yield make
+
+    for batcher in batchers:
+        await batcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_call(fake_batcher):
+    model = FakeModel()
+    batcher = fake_batcher(model)
+
+    results = await asyncio.gather(*[
+        batcher.submit(f"text {i}", ["person"]) for i in range(5)
+    ])
+
+    assert len(model.calls) == 1
+    assert model.calls[0][0] == [f"text {i}" for i in range(5)]
+    assert [r[0]["text"] for r in results] == [f"text {i}" for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_batch_size_is_capped(fake_batcher):
+    model = FakeModel()
+    batcher = fake_batcher(model)
+    batcher.max_batch = 4
+
+    await asyncio.gather(*[batcher.submit(f"t{i}", ["person"]) for i in range(10)])
+
+    assert [len(texts) for texts, _, _ in model.calls] == [4, 4, 2]
+
+
+@pytest.mark.asyncio
+async def test_requests_grouped_by_labels_and_threshold(fake_batcher):
+    model = FakeModel()
+    batcher = fake_batcher(model)
+
+    results = await asyncio.gather(
+        batcher.submit("a", ["person"], 0.3),
+        batcher.submit("b", ["location"], 0.3),
+        batcher.submit("c", ["person"], 0.5),
+        batcher.submit("d", ["person"], 0.3),
+    )
+
+    groups = sorted((labels, threshold, texts) for texts, labels, threshold in model.calls)
+    assert groups == [
+        (("location",), 0.3, ["b"]),
+        (("person",), 0.3, ["a", "d"]),
+        (("person",), 0.5, ["c"]),
+    ]
+    assert [r[0]["label"] for r in results] == ["person", "location", "person", "person"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_break_batch(fake_batcher):
+    model = FakeModel()
+    model.release.clear()
+    batcher = fake_batcher(model)
+
+    cancelled = asyncio.create_task(batcher.submit("gone", ["person"]))
+    kept = asyncio.create_task(batcher.submit("kept", ["person"]))
+
+    # Let both requests join the batch, then drop one while the model runs
+    await asyncio.sleep(0.1)
+    cancelled.cancel()
+    model.release.set()
+
+    result = await kept
+    assert result[0]["text"] == "kept"
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+
+    # The batcher keeps serving after the cancellation
+    assert (await batcher.submit("next", ["person"]))[0]["text"] == "next"
+
+
+@pytest.mark.asyncio
+async def test_failing_input_only_fails_its_own_request(fake_batcher):
+    model = FakeModel(fail_on="boom")
+    batcher = fake_batcher(model)
+
+    ok, bad = await asyncio.gather(
+        batcher.submit("ok", ["person"]),
+        batcher.submit("boom", ["person"]),
+        return_exceptions=True
+    )
+
+    assert ok[0]["text"] == "ok"
+    assert isinstance(bad, ValueError)
+
+
+@pytest.mark.asyncio
+async def test_stop_fails_in_flight_requests(fake_batcher):
+    model = FakeModel()
+    model.release.clear()
+    batcher = fake_batcher(model)
+
+    running = asyncio.create_task(batcher.submit("running", ["person"]))
+    waiting = asyncio.create_task(batcher.submit("waiting", ["location"]))
+
+    # Both requests share one collected batch; the first group is blocked
+    # in the model and the second has not been dispatched yet
+    await asyncio.sleep(0.1)
+    await batcher.stop()
+    model.release.set()
+
+    for task in (running, waiting):
+        with pytest.raises(RuntimeError, match="Batcher stopped"):
+            await asyncio.wait_for(task, timeout=1)
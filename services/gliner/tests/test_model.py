@@ -0,0 +1,124 @@
+"""
+Tests for GLiNER output schema checking.
+"""
+
+import sys
+import types
+
+import pytest
+
+import model
+from model import GLiNERModel, check_entity_schema
+
+
+def make_entity(**overrides):
+    entity = {"text": "Alice", "label": "person", "start": 0, "end": 5, "score": 0.95}
+    entity.update(overrides)
+    return entity
+
+
+def test_valid_entity_passes():
+    check_entity_schema(make_entity())
+    check_entity_schema(make_entity(extra="ignored"))
+
+
+def test_missing_field_rejected():
+    entity = make_entity()
+    del entity["score"]
+    with pytest.raises(RuntimeError, match="missing field 'score'"):
+        check_entity_schema(entity)
+
+
+@pytest.mark.parametrize("field,value", [
+    ("start", "0"),
+    ("end", 5.0),
+    ("score", "0.9"),
+    ("label", None),
+    ("start", True),
+])
+def test_wrong_type_rejected(field, value):
+    with pytest.raises(RuntimeError, match=f"field '{field}'"):
+        check_entity_schema(make_entity(**{field: value}))
+
+
+def test_thread_count_is_absolute_across_repeated_loads(monkeypatch):
+    threads = {"count": 8}
+    torch_stub = types.SimpleNamespace(
+        get_num_threads=lambda: threads["count"],
+        set_num_threads=lambda n: threads.update(count=n),
+    )
+    monkeypatch.setitem(sys.modules, "torch", torch_stub)
+    monkeypatch.setattr(model, "_default_torch_threads", None)
+
+    gliner = GLiNERModel(device="cpu")
+    for _ in range(3):
+        gliner._configure_threads()
+
+    assert threads["count"] == 7
+
+
+class FakeLabelEncoder:
+    """Bi-encoder stand-in that counts label encodings."""
+
+    def __init__(self, supported: bool = True):
+        self.supported = supported
+        self.encoded = []
+
+    def encode_labels(self, labels):
+        if not self.supported:
+            raise NotImplementedError("uni-encoder")
+        self.encoded.append(tuple(labels))
+        return f"embeds:{','.join(labels)}"
+
+
+def make_label_model(encoder: FakeLabelEncoder) -> GLiNERModel:
+    gliner = GLiNERModel()
+    gliner._model = encoder
+    gliner._loaded = True
+    gliner._supports_label_embeds = True
+    return gliner
+
+
+def test_label_embeddings_encoded_once_per_label_set():
+    encoder = FakeLabelEncoder()
+    gliner = make_label_model(encoder)
+
+    results = [gliner._label_embeddings(["person", "location"]) for _ in range(3)]
+
+    assert encoder.encoded == [("person", "location")]
+    assert results == ["embeds:person,location"] * 3
+
+
+def test_label_cache_hit_refreshes_recency(monkeypatch):
+    monkeypatch.setattr(model, "LABEL_CACHE_SIZE", 2)
+    encoder = FakeLabelEncoder()
+    gliner = make_label_model(encoder)
+
+    gliner._label_embeddings(["a"])
+    gliner._label_embeddings(["b"])
+    gliner._label_embeddings(["a"])  # hit moves "a" to most recent
+    gliner._label_embeddings(["c"])  # evicts "b", the least recent
+
+    assert list(gliner._label_cache) == [("a",), ("c",)]
+
+
+def test_label_cache_is_bounded():
+    encoder = FakeLabelEncoder()
+    gliner = make_label_model(encoder)
+
+    for i in range(200):
+        gliner._label_embeddings([f"label{i}"])
+
+    assert len(gliner._label_cache) == model.LABEL_CACHE_SIZE
+    assert ("label199",) in gliner._label_cache
+    assert ("label0",) not in gliner._label_cache
+
+
+def test_label_cache_disabled_for_uni_encoder():
+    encoder = FakeLabelEncoder(supported=False)
+    gliner = make_label_model(encoder)
+
+    assert gliner._label_embeddings(["person"]) is None
+    assert gliner._supports_label_embeds is False
+    assert gliner._label_embeddings(["person"]) is None
+    assert not gliner._label_cache